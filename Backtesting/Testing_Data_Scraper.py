@@ -8,41 +8,89 @@ multiclass labels (±1/0), and writes out a labeled CSV.
 """
 
 # --- Imports ---
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from datetime import timedelta
 import argparse
 
+# --- Constants ---
+# Multiplier that packs (ticker code, day number) into one sortable int64 key;
+# must exceed any day count since the epoch
+KEY_STRIDE = 1_000_000
+
 # --- Functions ---
-def get_price_changes(ticker: str, filing_date: pd.Timestamp) -> pd.Series:
+def download_price_history(tickers, start: pd.Timestamp, end: pd.Timestamp) -> dict:
+    """
+    Download daily history for all tickers in one batched yfinance request.
+    Returns {ticker: DataFrame}; tickers with no data are omitted.
+    """
+    tickers = sorted(set(tickers))
+    if not tickers:
+        return {}
+    data = yf.download(tickers, start=start, end=end, group_by="ticker",
+                       threads=True, progress=False)
+
+    history = {}
+    downloaded = set(data.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in downloaded:
+            continue
+        # The batch frame is indexed on the union of all tickers' trading days
+        hist = data[ticker].dropna(how="all")
+        if not hist.empty:
+            history[ticker] = hist
+    return history
+
+
+def compute_price_changes(history: dict, tickers: pd.Series,
+                          filing_dates: pd.Series) -> pd.DataFrame:
     """
-    Returns a Series with:
+    Returns a DataFrame (aligned to `tickers`) with, for every filing at once:
       pct_1d: (close_t+1 - close_t-1) / close_t-1
       pct_3d: (close_t+3 - close_t)   / close_t
-    around the given filing_date.
+    using only trading days from 7 days before through 5 days after the
+    filing date. Filings with no price on the filing date get NaN.
     """
-    # Download 7 days before through 5 days after
-    start = filing_date - timedelta(days=7)
-    end   = filing_date + timedelta(days=5)
-    hist = yf.download(ticker, start=start, end=end, progress=False)
+    result = pd.DataFrame(np.nan, index=tickers.index, columns=["pct_1d", "pct_3d"])
+    names = sorted(history)
+    if not names:
+        return result
 
-    # Normalize index to date objects
-    dates = [d.date() for d in hist.index]
-    if filing_date.date() not in dates:
-        return pd.Series([None, None], index=["pct_1d","pct_3d"])
+    # Concatenate every ticker's history into flat arrays; ticker k owns
+    # rows starts[k] : starts[k] + lengths[k], sorted by day
+    lengths = np.array([len(history[t]) for t in names])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    close = np.concatenate([history[t]["Close"].to_numpy(dtype=float) for t in names])
+    close[close == 0] = np.nan
+    day = np.concatenate([
+        history[t].index.values.astype("datetime64[D]").astype(np.int64) for t in names
+    ])
+    # (ticker, day) keys are globally sorted, so one searchsorted finds every filing day
+    flat_key = np.repeat(np.arange(len(names)), lengths) * KEY_STRIDE + day
 
-    idx = dates.index(filing_date.date())
-    close_prev = hist["Close"].iloc[idx-1]     if idx-1 >= 0         else None
-    close_0    = hist["Close"].iloc[idx]       if idx   < len(hist) else None
-    close_1d   = hist["Close"].iloc[idx+1]     if idx+1 < len(hist) else None
-    close_3d   = hist["Close"].iloc[idx+3]     if idx+3 < len(hist) else None
+    code = pd.Index(names).get_indexer(tickers)
+    known = code >= 0
+    code = np.where(known, code, 0)
+    filing_day = filing_dates.to_numpy().astype("datetime64[D]").astype(np.int64)
+    seg_start = starts[code]
+    seg_end = seg_start + lengths[code]
+    target = code * KEY_STRIDE + filing_day
+    pos = np.searchsorted(flat_key, target)
+    found = known & (pos < seg_end) & (flat_key[np.minimum(pos, len(flat_key) - 1)] == target)
 
-    pct_1d = ((close_1d - close_prev) / close_prev
-              if close_prev and close_1d else None)
-    pct_3d = ((close_3d - close_0)    / close_0
-              if close_0 and close_3d   else None)
+    def close_at(offset):
+        p = pos + offset
+        ok = found & (p >= seg_start) & (p < seg_end)
+        p = np.clip(p, 0, len(close) - 1)
+        ok &= (day[p] >= filing_day - 7) & (day[p] < filing_day + 5)
+        return np.where(ok, close[p], np.nan)
 
-    return pd.Series([pct_1d, pct_3d], index=["pct_1d","pct_3d"])
+    close_prev, close_0 = close_at(-1), close_at(0)
+    close_1d, close_3d = close_at(1), close_at(3)
+    result["pct_1d"] = (close_1d - close_prev) / close_prev
+    result["pct_3d"] = (close_3d - close_0) / close_0
+    return result
 
 
 # --- Main Script ---
@@ -54,23 +102,22 @@ def main(input_csv: str, output_csv: str):
     df = df.dropna(subset=["ticker"]).copy()
     df["ticker"] = df["ticker"].astype(str)
 
-    # 3) Compute price-change features
-    price_feats = df.apply(
-        lambda row: get_price_changes(row["ticker"], row["filingDate"]),
-        axis=1, result_type="expand"
+    # 3) Compute price-change features from a single batched download
+    history = download_price_history(
+        df["ticker"].unique(),
+        start=df["filingDate"].min() - timedelta(days=7),
+        end=df["filingDate"].max() + timedelta(days=5),
     )
-    price_feats.columns = ["pct_1d", "pct_3d"]
+    price_feats = compute_price_changes(history, df["ticker"], df["filingDate"])
 
-    # 4) Merge back into main DataFrame
+    # 4) Merge back into main DataFrame (missing prices are NaN -> label 0)
     df["pct_1d"] = price_feats["pct_1d"]
     df["pct_3d"] = price_feats["pct_3d"]
-    df["label_1d_extreme"] = df["pct_1d"].apply(
-        lambda x: 1 if x is not None and x >= 0.05
-                  else (-1 if x is not None and x <= -0.05 else 0)
+    df["label_1d_extreme"] = np.select(
+        [df["pct_1d"] >= 0.05, df["pct_1d"] <= -0.05], [1, -1], default=0
     )
-    df["label_3d_extreme"] = df["pct_3d"].apply(
-        lambda x: 1 if x is not None and x >= 0.10
-                  else (-1 if x is not None and x <= -0.10 else 0)
+    df["label_3d_extreme"] = np.select(
+        [df["pct_3d"] >= 0.10, df["pct_3d"] <= -0.10], [1, -1], default=0
     )
     df.drop(columns=["pct_1d", "pct_3d"], inplace=True)
 
@@ -13,6 +13,9 @@ If no date is provided, defaults to yesterday's date.
 
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
 import time
 from datetime import datetime, timedelta
@@ -20,18 +23,41 @@ import sys
 import os
 import contextlib
 import io
+import csv
 import openai
 from openai import OpenAI
+import tiktoken
+from selectolax.lexbor import LexborHTMLParser
 from tqdm import tqdm
 import yfinance as yf
 import re
 from datetime import timedelta
 import openpyxl
 import json
+import orjson
+import pickle
+import hashlib
+import mmap
+import tempfile
+import multiprocessing as mp
+import threading
+import functools
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 
 # -- OpenAI Configuration --
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))  # Make sure to set this env var
+SUMMARY_MODEL = "gpt-4.1"
+ENCODING = tiktoken.get_encoding("o200k_base")  # gpt-4.1 tokenizer
+# Filing text sent for summarization is truncated to this many tokens
+MAX_INPUT_TOKENS = 1500
+PROMPT_HEAD = (
+    "You are a financial research assistant. "
+    "Provide a concise 2–3 sentence summary of this SEC filing, "
+    "focusing on key facts and catalysts behind the filing. Do NOT include your own interpretation "
+    "Text: "
+)
 
 # -- Configuration --
 # IMPORTANT: Replace <your_email@domain.com> with your contact email per SEC guidelines.
@@ -44,6 +70,24 @@ HEADERS = {
     "Connection": "keep-alive"
 }
 
+# SEC fair-access policy caps automated traffic at 10 requests/second per client.
+MAX_REQUESTS_PER_SECOND = 9
+MAX_CONCURRENT_DOWNLOADS = 8
+# Summaries are bound by OpenAI latency; keep below the account's RPM limit.
+MAX_CONCURRENT_SUMMARIES = 16
+# Yahoo Finance info lookups; unthrottled, so keep the fan-out modest
+MAX_CONCURRENT_INFO_LOOKUPS = 8
+# Dates are processed in parallel worker processes that split the SEC request budget
+MAX_DATE_WORKERS = 8
+
+# company_tickers.json is cached locally and refreshed once a day
+CIK_MAP_CACHE = Path("cik_map.json")
+CIK_MAP_MAX_AGE = 24 * 60 * 60  # seconds
+
+# Set FILING_CACHE_DIR to keep downloaded filings on disk, so re-runs and
+# backfills screen them locally instead of re-downloading from sec.gov
+FILING_CACHE_DIR = os.getenv("FILING_CACHE_DIR")
+
 # Forms and keywords to flag
 FORM_TYPES = ["8-K", "4", "13D", "13G", "DEF 14A"]
 KEYWORDS = [
@@ -60,19 +104,88 @@ KEYWORDS = [
     # add more patterns here as needed
 ]
 
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls at least 1/rate seconds apart,
+    so concurrent downloads stay under the SEC request cap.
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+SEC_RATE_LIMITER = RateLimiter(MAX_REQUESTS_PER_SECOND)
+
+def make_session():
+    """
+    Build a pooled keep-alive session for sec.gov requests, so TLS
+    connections are reused instead of re-established per request.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("https://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        # raise_on_status=False hands the last response back, so raise_for_status still raises HTTPError
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                          raise_on_status=False),
+    ))
+    return session
+
+SESSION = make_session()
+
+def init_date_worker(n_workers):
+    """
+    Pool initializer for date-level worker processes: give each process its
+    own connection pool and an equal share of the SEC request budget and of
+    the OpenAI and Yahoo Finance concurrency limits.
+    """
+    global SESSION, SEC_RATE_LIMITER, MAX_CONCURRENT_SUMMARIES, MAX_CONCURRENT_INFO_LOOKUPS
+    SESSION = make_session()
+    SEC_RATE_LIMITER = RateLimiter(MAX_REQUESTS_PER_SECOND / n_workers)
+    MAX_CONCURRENT_SUMMARIES = max(1, MAX_CONCURRENT_SUMMARIES // n_workers)
+    MAX_CONCURRENT_INFO_LOOKUPS = max(1, MAX_CONCURRENT_INFO_LOOKUPS // n_workers)
+
+@functools.lru_cache(maxsize=1)
 def get_cik_ticker_map():
     """
-    Fetch the SEC's ticker-to-CIK JSON.
+    Fetch the SEC's ticker-to-CIK JSON (from CIK_MAP_CACHE if under a day old).
     Returns two dicts:
       - ticker_to_cik: {TICKER: CIK}
       - cik_to_ticker: {CIK: TICKER}
     """
-    url = "https://www.sec.gov/files/company_tickers.json"
-    resp = requests.get(url, headers=HEADERS)
-    resp.raise_for_status()
-    data = resp.json()
-    ticker_to_cik = {v["ticker"].upper(): str(v["cik_str"]).zfill(10) for v in data.values()}
-    cik_to_ticker = {cik: ticker for ticker, cik in ticker_to_cik.items()}
+    data = None
+    if CIK_MAP_CACHE.exists() and time.time() - CIK_MAP_CACHE.stat().st_mtime < CIK_MAP_MAX_AGE:
+        try:
+            data = orjson.loads(CIK_MAP_CACHE.read_bytes())
+        except orjson.JSONDecodeError:
+            data = None  # unreadable cache: fall through and re-download
+    if data is None:
+        url = "https://www.sec.gov/files/company_tickers.json"
+        SEC_RATE_LIMITER.wait()
+        resp = SESSION.get(url)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        # Write to a temp file and rename, so an interrupted run never leaves a partial cache
+        with tempfile.NamedTemporaryFile(dir=CIK_MAP_CACHE.parent, prefix=CIK_MAP_CACHE.name, delete=False) as f:
+            f.write(resp.content)
+        os.replace(f.name, CIK_MAP_CACHE)
+
+    # Build both maps in one pass; a CIK keeps its first-listed (primary) ticker
+    ticker_to_cik, cik_to_ticker = {}, {}
+    for v in data.values():
+        ticker = v["ticker"].upper()
+        cik = str(v["cik_str"]).zfill(10)
+        ticker_to_cik[ticker] = cik
+        cik_to_ticker.setdefault(cik, ticker)
     return ticker_to_cik, cik_to_ticker
 
 def fetch_master_index(date):
@@ -84,7 +197,8 @@ def fetch_master_index(date):
     year = dt.year
     qtr = (dt.month - 1) // 3 + 1
     idx_url = f"https://www.sec.gov/Archives/edgar/daily-index/{year}/QTR{qtr}/master.{date}.idx"
-    resp = requests.get(idx_url, headers=HEADERS)
+    SEC_RATE_LIMITER.wait()
+    resp = SESSION.get(idx_url)
     resp.raise_for_status()
     return resp.text
 
@@ -93,61 +207,189 @@ def parse_index(index_text):
     Parse the master index text and return a list of dicts for entries
     matching FORM_TYPES.
     """
-    lines = index_text.splitlines()
     # Find the header line that starts with "CIK|Company Name|Form Type"
-    start = None
-    for idx, line in enumerate(lines):
-        if line.strip().startswith("CIK|Company Name|Form Type"):
-            start = idx + 1
-            break
-    if start is None:
+    header = re.search(r"^CIK\|Company Name\|Form Type", index_text, re.MULTILINE)
+    if header is None:
         return []
-    entries = []
-    for line in lines[start:]:
-        parts = line.split("|")
-        if len(parts) != 5:
-            continue
-        cik, comp, form, date_str, filename = parts
-        if form not in FORM_TYPES:
-            continue
-        # Parse filing date, handling both 'YYYY-MM-DD' and 'YYYYMMDD'
-        if "-" in date_str:
-            filing_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        else:
-            filing_date = datetime.strptime(date_str, "%Y%m%d").date()
-
-        entries.append({
-            "cik": cik.zfill(10),
-            "form": form,
-            "filingDate": filing_date,
-            "filename": filename
-        })
-    return entries
+    df = pd.read_csv(
+        io.StringIO(index_text[header.start():]),
+        sep="|",
+        header=0,
+        names=["cik", "company", "form", "filingDate", "filename"],
+        dtype=str,
+        keep_default_na=False,
+        quoting=csv.QUOTE_NONE,
+        on_bad_lines="skip",
+    )
+    # Short rows (like the dashed separator) are padded with "" or NaN, not skipped;
+    # drop them along with non-matching forms, as the old len(parts) != 5 check did
+    complete = df.notna().all(axis=1) & df.ne("").all(axis=1)
+    df = df[complete & df["form"].isin(FORM_TYPES)].copy()
+    df["cik"] = df["cik"].str.zfill(10)
+    # Dates come as 'YYYYMMDD' or 'YYYY-MM-DD'; normalize to one fixed format for a single C parse
+    df["filingDate"] = pd.to_datetime(df["filingDate"].str.replace("-", "", regex=False), format="%Y%m%d").dt.date
+    return df[["cik", "form", "filingDate", "filename"]].to_dict("records")
 
 def fetch_document_text(url):
     """Download the filing text/HTML from the given URL."""
-    resp = requests.get(url, headers=HEADERS)
+    SEC_RATE_LIMITER.wait()
+    resp = SESSION.get(url)
     resp.raise_for_status()
     return resp.text
 
+def document_has_keywords(url, keywords, chunk_size=65536):
+    """
+    Stream the filing at url and return True as soon as any keyword appears
+    (case-insensitive). Non-matching filings are never held in memory whole.
+    """
+    # Scan the raw bytes: no per-chunk decode and no lowercased copy
+    pattern = compile_keywords(tuple(keywords), as_bytes=True)
+    # Keep the tail of each chunk so keywords spanning a chunk boundary still
+    # match; leave room for markup between the words of a phrase
+    overlap = max(len(kw.encode("utf-8")) for kw in keywords) + 4096
+    tail = b""
+    SEC_RATE_LIMITER.wait()
+    with SESSION.get(url, stream=True) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_content(chunk_size):
+            window = tail + chunk
+            if pattern.search(window):
+                return True
+            tail = window[-overlap:] if overlap else b""
+    return False
+
+def html_to_text(text):
+    """
+    Strip markup from an HTML filing so keyword scans and summaries only see
+    its visible text. Plain-text filings are returned unchanged.
+    """
+    if "<" not in text[:200]:
+        return text
+    tree = LexborHTMLParser(text)
+    tree.strip_tags(["script", "style"])
+    root = tree.body or tree.root
+    if root is None:
+        return text
+    return " ".join(root.text(separator=" ").split())
+
+# The index lists some filings under several CIKs (e.g. 13D filer and subject),
+# so entries can share a cache path; one lock per path serializes their downloads
+_CACHE_LOCKS = {}
+_CACHE_LOCKS_GUARD = threading.Lock()
+
+def ensure_cached(url, path, chunk_size=65536):
+    """
+    Download the filing at url to path unless it is already cached.
+    The body is streamed to a unique temp file and renamed into place, so
+    readers never see a partial file.
+    """
+    with _CACHE_LOCKS_GUARD:
+        lock = _CACHE_LOCKS.setdefault(path, threading.Lock())
+    with lock:
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        SEC_RATE_LIMITER.wait()
+        with SESSION.get(url, stream=True) as resp:
+            resp.raise_for_status()
+            with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, suffix=".part", delete=False) as f:
+                try:
+                    for chunk in resp.iter_content(chunk_size):
+                        f.write(chunk)
+                except BaseException:
+                    f.close()
+                    os.remove(f.name)
+                    raise
+        os.replace(f.name, path)
+
+def file_has_keywords(path, keywords):
+    """
+    Return True if any keyword appears in the file at path (case-insensitive).
+    The file is memory-mapped and scanned in place, without reading it into memory.
+    """
+    if path.stat().st_size == 0:
+        return False
+    pattern = compile_keywords(tuple(keywords), as_bytes=True)
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return pattern.search(mm) is not None
+
+def fetch_entry(entry):
+    """
+    Screen the filing for a parsed index entry and download it in full only
+    if it mentions one of KEYWORDS; the full text is stripped of HTML.
+    With FILING_CACHE_DIR set, the filing is downloaded once into the cache
+    and screened from disk.
+    Returns (entry, text), with text=None if it did not match or failed.
+    """
+    url = f"https://www.sec.gov/Archives/{entry['filename']}"
+    try:
+        if FILING_CACHE_DIR:
+            path = Path(FILING_CACHE_DIR) / entry["filename"].replace("/", "_")
+            ensure_cached(url, path)
+            if not file_has_keywords(path, KEYWORDS):
+                return entry, None
+            return entry, html_to_text(path.read_bytes().decode("utf-8", errors="replace"))
+        if not document_has_keywords(url, KEYWORDS):
+            return entry, None
+        return entry, html_to_text(fetch_document_text(url))
+    except (requests.exceptions.RequestException, OSError):
+        return entry, None
+
+# Whitespace, non-breaking space entities and short inline tags between words
+BYTES_WORD_GAP = r"(?:\s|&nbsp;|&#160;|&#xa0;|<[^<>]{0,300}>)+"
+
+@functools.lru_cache(maxsize=None)
+def compile_keywords(keywords, as_bytes=False):
+    """
+    Compile a tuple of keywords into a single case-insensitive alternation,
+    so a document is scanned once instead of once per keyword.
+    With as_bytes=True the pattern matches raw UTF-8/ASCII bytes (IGNORECASE
+    folds ASCII letters), so undecoded filing bytes can be scanned directly.
+    """
+    # Longest first, so a keyword wins over any shorter one it contains
+    ordered = sorted(keywords, key=len, reverse=True)
+    if as_bytes:
+        # Raw HTML can split a phrase with entities, line breaks or inline tags
+        # (e.g. "public&nbsp;offering", "PIPE</span> <span>financing"), which
+        # html_to_text would collapse to a single space
+        alternation = "|".join(
+            BYTES_WORD_GAP.join(re.escape(word) for word in kw.split())
+            for kw in ordered
+        )
+        return re.compile(alternation.encode("utf-8"), re.IGNORECASE)
+    alternation = "|".join(map(re.escape, ordered))
+    return re.compile(alternation, re.IGNORECASE)
+
+@functools.lru_cache(maxsize=None)
+def compile_keyword_starts(keywords):
+    """
+    Like compile_keywords, but wrapped in a capturing lookahead so finditer
+    reports the longest keyword starting at every position, including
+    positions inside another keyword's match.
+    """
+    return re.compile(f"(?=({compile_keywords(keywords).pattern}))", re.IGNORECASE)
+
 def find_keywords(text, keywords):
     """Return a list of keywords that appear in text (case-insensitive)."""
-    tl = text.lower()
-    return [kw for kw in keywords if kw in tl]
+    pattern = compile_keyword_starts(tuple(keywords))
+    found = {m.group(1).lower() for m in pattern.finditer(text)}
+    # Any other keyword starting at the same position is a prefix of the longest one
+    return [
+        kw for kw in keywords
+        if any(match.startswith(kw.lower()) for match in found)
+    ]
 
 def summarize_text(text, max_tokens=200):
     """
     Use OpenAI to generate a concise 2–3 sentence summary of key facts and catalysts.
     """
-    prompt = (
-        "You are a financial research assistant. "
-        "Provide a concise 2–3 sentence summary of this SEC filing, "
-        "focusing on key facts and catalysts behind the filing. Do NOT include your own interpretation "
-        f"Text: {text[:4000]}"
-    )
+    # Truncate on tokens, not characters. Tokens average ~4 characters, so an
+    # 8x-character prefix fills the budget without encoding a multi-MB filing
+    ids = ENCODING.encode(text[:MAX_INPUT_TOKENS * 8], disallowed_special=())
+    prompt = PROMPT_HEAD + ENCODING.decode(ids[:MAX_INPUT_TOKENS])
     try:
         response = client.chat.completions.create(
-            model="gpt-4.1",
+            model=SUMMARY_MODEL,
             messages=[{"role": "system", "content": prompt}],
             max_tokens=max_tokens,
             temperature=0.0,
@@ -156,46 +398,239 @@ def summarize_text(text, max_tokens=200):
     except Exception:
         return ""
 
+def download_price_history(tickers, start, end):
+    """
+    Download daily price history for all tickers in a single batched
+    yfinance request. Returns {TICKER: DataFrame}; tickers with no data
+    are omitted.
+    """
+    tickers = sorted({t for t in tickers if t})
+    if not tickers:
+        return {}
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        data = yf.download(tickers, start=start, end=end, group_by="ticker", threads=True, progress=False)
+
+    history = {}
+    downloaded = set(data.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in downloaded:
+            continue
+        # The batch frame is indexed on the union of all trading days
+        hist = data[ticker].dropna(how="all")
+        if not hist.empty:
+            history[ticker] = hist
+    return history
+
+@functools.lru_cache(maxsize=None)
+def ticker_info(ticker):
+    """
+    yfinance .info for one ticker, memoized so tickers that file repeatedly
+    are only looked up once per process. With several date workers each
+    process keeps its own cache. Failed lookups raise and are not cached.
+    """
+    return yf.Ticker(ticker).info
+
+def fetch_ticker_info(tickers):
+    """
+    Fetch yfinance .info for each unique ticker concurrently.
+    Returns {TICKER: info dict}; failed lookups map to {}.
+    """
+    tickers = sorted({t for t in tickers if t})
+
+    def info(ticker):
+        try:
+            return ticker_info(ticker)
+        except Exception:
+            return {}
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_INFO_LOOKUPS) as pool:
+        return dict(zip(tickers, pool.map(info, tickers)))
+
 # --- Inserted get_price_changes ---
-def get_price_changes(ticker, filing_date):
+def get_price_changes(hist, filing_date):
     """
     Returns a Series with price features: pct_1d, pct_3d, pct_before,
     volatility_before, volume_change around filing_date.
+    `hist` is the ticker's daily history from download_price_history (or None).
     """
+    empty = pd.Series([None] * 5,
+        index=["pct_1d","pct_3d","pct_before","volatility_before","volume_change"]
+    )
+    if hist is None:
+        return empty
+
+    # Locate the 7-days-before / 5-days-after window and the filing day by binary search
     start = filing_date - timedelta(days=7)
     end   = filing_date + timedelta(days=5)
-    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
-        hist = yf.download(ticker, start=start, end=end, progress=False)
+    lo, hi = hist.index.searchsorted([pd.Timestamp(start), pd.Timestamp(end)])
+    close  = hist["Close"].to_numpy()[lo:hi]
+    volume = hist["Volume"].to_numpy()[lo:hi]
+    idx = hist.index.searchsorted(pd.Timestamp(filing_date)) - lo
+    if idx >= len(close) or hist.index[lo + idx].date() != filing_date:
+        return empty
 
-    dates = [d.date() for d in hist.index]
-    if filing_date not in dates:
-        return pd.Series([None] * 5,
-            index=["pct_1d","pct_3d","pct_before","volatility_before","volume_change"]
-        )
-
-    idx = dates.index(filing_date)
-    close_prev = hist["Close"].iloc[idx-1] if idx-1 >= 0 else None
-    close_0    = hist["Close"].iloc[idx]
-    close_1d   = hist["Close"].iloc[idx+1] if idx+1 < len(hist) else None
-    close_3d   = hist["Close"].iloc[idx+3] if idx+3 < len(hist) else None
+    close_prev = close[idx-1] if idx-1 >= 0 else None
+    close_0    = close[idx]
+    close_1d   = close[idx+1] if idx+1 < len(close) else None
+    close_3d   = close[idx+3] if idx+3 < len(close) else None
 
     # 1-day return t-1 -> t+1
     pct_1d = (close_1d - close_prev) / close_prev if close_prev and close_1d else None
     pct_3d = (close_3d - close_0)    / close_0    if close_3d else None
     pct_before = (close_0 - close_prev) / close_prev if close_prev else None
 
-    vol_before = hist["Close"].iloc[max(0, idx-5):idx].std()
-    try:
-        avg_vol_prior = hist["Volume"].iloc[max(0, idx-5):idx].mean()
-        volume_change = hist["Volume"].iloc[idx] / avg_vol_prior if avg_vol_prior and not pd.isna(avg_vol_prior) else None
-    except:
-        volume_change = None
+    prior_close  = close[max(0, idx-5):idx]
+    prior_volume = volume[max(0, idx-5):idx]
+    vol_before = prior_close.std(ddof=1) if len(prior_close) > 1 else np.nan
+    avg_vol_prior = prior_volume.mean() if len(prior_volume) else np.nan
+    volume_change = volume[idx] / avg_vol_prior if avg_vol_prior and not np.isnan(avg_vol_prior) else None
 
     return pd.Series(
         [pct_1d, pct_3d, pct_before, vol_before, volume_change],
         index=["pct_1d","pct_3d","pct_before","volatility_before","volume_change"]
     )
 
+def read_csv_as_text(source):
+    """Read a results CSV with every cell as a string ('' when missing)."""
+    return pd.read_csv(source, dtype=str, keep_default_na=False)
+
+def row_keys(df):
+    """
+    Hash each row of a read_csv_as_text frame into a stable key, so whole
+    rows can be de-duplicated across runs by value, the way drop_duplicates()
+    compares them: numbers compare numerically (3 == 3.0) and booleans
+    ignore case (TRUE == True), whatever dtype a column was written with.
+    """
+    def normalize(cell):
+        try:
+            return repr(float(cell))
+        except ValueError:
+            return cell.capitalize() if cell.lower() in ("true", "false") else cell
+
+    return [
+        hashlib.sha1("\x1f".join(map(normalize, row)).encode("utf-8")).hexdigest()
+        for row in df.itertuples(index=False, name=None)
+    ]
+
+def existing_row_keys(output_csv):
+    """Keys of every row already in output_csv."""
+    return set(row_keys(read_csv_as_text(output_csv)))
+
+def append_results(df, output_csv):
+    """
+    Append rows of df that were not written by an earlier run to output_csv.
+    Rows are compared whole, as the old drop_duplicates() did. Keys of
+    written rows are kept in a sidecar pickle (<output_csv>.seen.pkl), so
+    the existing CSV does not have to be re-read and rewritten every run.
+    Returns the number of rows appended.
+    """
+    seen_path = Path(f"{output_csv}.seen.pkl")
+    exists = os.path.exists(output_csv)
+    rewrite = exists and list(pd.read_csv(output_csv, nrows=0).columns) != list(df.columns)
+    if not exists or rewrite:
+        # No CSV (or one about to be rewritten): any sidecar describes rows that are gone
+        seen = set()
+    elif seen_path.exists():
+        seen = pickle.loads(seen_path.read_bytes())
+    else:
+        seen = existing_row_keys(output_csv)
+
+    # Key new rows as they will read back from the CSV, so reruns compare like with like
+    new_mask = []
+    for key in row_keys(read_csv_as_text(io.StringIO(df.to_csv(index=False)))):
+        new_mask.append(key not in seen)
+        seen.add(key)
+    new_rows = df[new_mask]
+
+    # Write the CSV before the sidecar, so keys are never recorded for unwritten rows
+    if rewrite:
+        # Older file with a different column layout: rewrite it once in the current layout
+        pd.read_csv(output_csv).reindex(columns=df.columns).to_csv(output_csv, index=False)
+        new_rows.to_csv(output_csv, mode="a", header=False, index=False)
+        seen = existing_row_keys(output_csv)
+    else:
+        new_rows.to_csv(output_csv, mode="a", header=not exists, index=False)
+    seen_path.write_bytes(pickle.dumps(seen))
+    return len(new_rows)
+
+def process_date(date_str):
+    """
+    Fetch, screen, summarize and enrich all filings for one date (YYYYMMDD).
+    Returns a list of result dicts, one per flagged filing.
+    """
+    _, cik_to_ticker = get_cik_ticker_map()
+
+    try:
+        index_text = fetch_master_index(date_str)
+    except requests.exceptions.HTTPError as e:
+        print(f"Error fetching index for {date_str}: {e}")
+        return []
+
+    entries = parse_index(index_text)
+    print(f"Found {len(entries)} filings matching forms {FORM_TYPES} on {date_str}.")
+    # Skip filers without a ticker and duplicate index rows before any download
+    entries = [e for e in entries if e["cik"] in cik_to_ticker]
+    entries = list({(e["cik"], e["filename"]): e for e in entries}.values())
+
+    # Downloads are network-bound, so fetch them concurrently (rate-limited)
+    flagged = []
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS) as pool:
+        fetched = pool.map(fetch_entry, entries)
+        for entry, text in tqdm(fetched, total=len(entries), desc=f"Processing filings on {date_str}", leave=False, colour="cyan"):
+            if text is None:
+                continue
+            matched = find_keywords(text, KEYWORDS)
+            if matched:
+                flagged.append((entry, text, matched))
+
+    # Text-based features: summarize all flagged filings in parallel
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SUMMARIES) as pool:
+        summaries = list(pool.map(summarize_text, [text for _, text, _ in flagged]))
+
+    # Price and fundamental features: one batched download for all flagged tickers
+    tickers = [cik_to_ticker[entry["cik"]] for entry, _, _ in flagged]
+    filing_dates = [entry["filingDate"] for entry, _, _ in flagged]
+    history = {}
+    if flagged:
+        # A failed batch leaves price features empty for this date, as a failed
+        # per-filing download used to for that filing, instead of aborting the date
+        try:
+            history = download_price_history(tickers, min(filing_dates) - timedelta(days=7), max(filing_dates) + timedelta(days=5))
+        except Exception as e:
+            print(f"Error downloading price history for {date_str}: {e}")
+    infos = fetch_ticker_info(tickers)
+
+    results = []
+    for (entry, _, matched), summary_text, ticker in zip(flagged, summaries, tickers):
+        try:
+            # Compute price features
+            price_feats = get_price_changes(history.get(ticker), entry["filingDate"])
+            vol_before    = price_feats["volatility_before"]
+            volume_change = price_feats["volume_change"]
+
+            # Fundamental features
+            info = infos.get(ticker, {})
+            market_cap = info.get("marketCap", None)
+            sector     = info.get("sector",   None)
+
+            results.append({
+                "ticker": ticker,
+                "form": entry["form"],
+                "filingDate": entry["filingDate"],
+                "keywords": ";".join(matched),
+                "summary": summary_text,
+                "volatility_before": vol_before,
+                "summary_length": len(summary_text),
+                "has_numbers": bool(re.search(r"\d", summary_text)),
+                "num_keywords_matched": len(matched),
+                "market_cap": market_cap,
+                "sector": sector
+            })
+        except Exception as e:
+            continue
+
+    return results
+
 def main(date_source=None, output_csv="master_flagged_filings.csv"):
     """
     Process either a single date (YYYYMMDD) or a CSV/XLSX file listing dates in a column 'date'.
@@ -207,55 +642,15 @@ def main(date_source=None, output_csv="master_flagged_filings.csv"):
     else:
         date_list = [date_source]
 
-    all_results = []
-    for date_str in tqdm(date_list, desc="Processing Dates", colour="green"):
-        try:
-            index_text = fetch_master_index(date_str)
-        except requests.exceptions.HTTPError as e:
-            print(f"Error fetching index for {date_str}: {e}")
-            continue
-
-        entries = parse_index(index_text)
-        print(f"Found {len(entries)} filings matching forms {FORM_TYPES} on {date_str}.")
-        _, cik_to_ticker = get_cik_ticker_map()
-
-        for entry in tqdm(entries, desc=f"Processing filings on {date_str}", leave=False, colour="cyan"):
-            url = f"https://www.sec.gov/Archives/{entry['filename']}"
-            try:
-                text = fetch_document_text(url)
-                matched = find_keywords(text, KEYWORDS)
-                if matched:
-                    ticker = cik_to_ticker.get(entry["cik"], "")
-
-                    # Compute price features
-                    price_feats = get_price_changes(ticker, entry["filingDate"])
-                    vol_before    = price_feats["volatility_before"]
-                    volume_change = price_feats["volume_change"]
-
-                    # Text-based features
-                    summary_text = summarize_text(text)
-
-                    # Fundamental features
-                    info = yf.Ticker(ticker).info
-                    market_cap = info.get("marketCap", None)
-                    sector     = info.get("sector",   None)
-
-                    all_results.append({
-                        "ticker": ticker,
-                        "form": entry["form"],
-                        "filingDate": entry["filingDate"],
-                        "keywords": ";".join(matched),
-                        "summary": summary_text,
-                        "volatility_before": vol_before,
-                        "summary_length": len(summary_text),
-                        "has_numbers": bool(re.search(r"\d", summary_text)),
-                        "num_keywords_matched": len(matched),
-                        "market_cap": market_cap,
-                        "sector": sector
-                    })
-                time.sleep(0.2)
-            except Exception as e:
-                continue
+    # Dates are independent, so fan them out across worker processes
+    n_workers = min(MAX_DATE_WORKERS, len(date_list))
+    if n_workers > 1:
+        get_cik_ticker_map()  # warm the on-disk cache once before forking
+        with mp.Pool(n_workers, initializer=init_date_worker, initargs=(n_workers,)) as pool:
+            per_date = list(tqdm(pool.imap(process_date, date_list), total=len(date_list), desc="Processing Dates", colour="green"))
+    else:
+        per_date = [process_date(date_str) for date_str in date_list]
+    all_results = [row for rows in per_date for row in rows]
 
     df = pd.DataFrame(all_results)
     df = df[[
@@ -271,11 +666,8 @@ def main(date_source=None, output_csv="master_flagged_filings.csv"):
         "market_cap",
         "sector"
     ]]
-    if os.path.exists(output_csv):
-        existing_df = pd.read_csv(output_csv)
-        df = pd.concat([existing_df, df], ignore_index=True).drop_duplicates()
-    df.to_csv(output_csv, index=False)
-    print(f"Saved {len(df)} flagged filings to {output_csv}")
+    saved = append_results(df, output_csv)
+    print(f"Saved {saved} new flagged filings to {output_csv}")
 
 if __name__ == "__main__":
     import sys